@@ -1,3 +1,11 @@
-from sympy import init_printing
-from .printer import MyLatexPrinter
-init_printing(latex_printer=lambda *args, **kwargs: MyLatexPrinter().doprint(*args))
+from . import _assemble_numba, basis_functions
+from .basis_functions import phi, psi, eval_fe_solution
+from .boundary_conditions import (DirichletBC, LeftDirichletBC, RightDirichletBC,
+                                  RobinBC, LeftRobinBC, RightRobinBC)
+from .fem_solver import FEMSolver
+from .mesh import Mesh, make_nodes
+from .ode import ODE
+
+# Load the compiled basis function and assembly kernels before any user code calls them
+basis_functions._warm_up()
+_assemble_numba._warm_up()
@@ -0,0 +1,128 @@
+"""Compiled kernels for the element by element assembly of the finite element system.
+
+The ODE coefficients are arbitrary Python callables, so they are evaluated at the quadrature
+points before calling these kernels and passed in as arrays. The kernels only perform the
+quadrature sums on the reference element.
+"""
+
+import numpy as np
+from ._jit import njit, prange
+
+@njit(cache=True)
+def reference_basis(xg):
+    """Tabulate the local basis functions on the reference element [0, 1].
+
+    The hat functions of the left and right nodes are 1 - xi and xi, and the bubble is
+    xi*(xi - 1)/2. On an element of width h the bubble values scale by h**2, the hat derivatives
+    by 1/h and the bubble derivative by h.
+
+    Args:
+        xg: Quadrature points on [-1, 1].
+
+    Returns:
+        tuple: Basis values and derivatives in reference coordinates, each of shape (3, nq).
+    """
+    nq = len(xg)
+    V = np.empty((3, nq))
+    dV = np.empty((3, nq))
+    for q in range(nq):
+        xi = 0.5 * (xg[q] + 1.0)
+        V[0, q] = 1.0 - xi
+        V[1, q] = xi
+        V[2, q] = 0.5 * xi * (xi - 1.0)
+        dV[0, q] = -1.0
+        dV[1, q] = 1.0
+        dV[2, q] = xi - 0.5
+    return V, dV
+
+@njit(cache=True)
+def assemble_element(h, a_e, b_e, c_e, f_e, V_ref, dV_ref, wg, symmetric, E_out, F_out):
+    """Compute the local stress matrix and load vector of element e.
+
+    The local basis functions are the hat functions of the element end points and, if E_out has room
+    for a third one, the bubble function of the element. The bubble-hat entries, such as the mass
+    term of c*phi*psi, are nonzero but deliberately skipped to match the baseline discretisation,
+    which keeps the global stress matrix tridiagonal. The stiffness, advection, mass and load terms are accumulated in a single pass over the
+    quadrature points. If the advection coefficient vanishes the local matrix is symmetric, so only
+    its upper triangle is integrated and then mirrored.
+
+    Args:
+        h: Width of the element.
+        a_e: Values of the coefficient a at the quadrature points of the element.
+        b_e: Values of the coefficient b at the quadrature points of the element.
+        c_e: Values of the coefficient c at the quadrature points of the element.
+        f_e: Values of the right-hand side f at the quadrature points of the element.
+        V_ref: Reference basis values from reference_basis.
+        dV_ref: Reference basis derivatives from reference_basis.
+        wg: Quadrature weights on [-1, 1].
+        symmetric: Flag indicating that b vanishes and the advection term can be skipped.
+        E_out: Zero initialized output local matrix of shape (n_local, n_local), indexed (test, trial).
+        F_out: Zero initialized output local load vector of shape (n_local,).
+    """
+    n_local = E_out.shape[0]
+    value_scale = (1.0, 1.0, h * h)
+    deriv_scale = (1.0 / h, 1.0 / h, h)
+
+    for q in range(len(wg)):
+        w = 0.5 * h * wg[q]
+        wa = w * a_e[q]
+        wb = w * b_e[q]
+        wc = w * c_e[q]
+        wf = w * f_e[q]
+
+        for p in range(n_local):
+            v = V_ref[p, q] * value_scale[p]
+            dv = dV_ref[p, q] * deriv_scale[p]
+            F_out[p] += wf * v
+            for r in range(p if symmetric else 0, n_local):
+                # Bubble-hat coupling is dropped, see above
+                if (p == 2) != (r == 2):
+                    continue
+                u = V_ref[r, q] * value_scale[r]
+                du = dV_ref[r, q] * deriv_scale[r]
+                entry = -wa * du * dv + wc * u * v
+                if not symmetric:
+                    entry += wb * du * v
+                E_out[p, r] += entry
+
+    if symmetric:
+        for p in range(n_local):
+            for r in range(p):
+                E_out[p, r] = E_out[r, p]
+
+@njit(cache=True, parallel=True, nogil=True)
+def assemble(element_h, a_vals, b_vals, c_vals, f_vals, xg, wg, n_local, symmetric=False):
+    """Compute the local stress matrices and load vectors of every element.
+
+    Every element writes to its own slice of the outputs, so the elements are processed in parallel.
+
+    Args:
+        element_h: Width of every element, shape (N+1,).
+        a_vals: Values of the coefficient a at the quadrature points, shape (N+1, nq).
+        b_vals: Values of the coefficient b at the quadrature points, shape (N+1, nq).
+        c_vals: Values of the coefficient c at the quadrature points, shape (N+1, nq).
+        f_vals: Values of the right-hand side f at the quadrature points, shape (N+1, nq).
+        xg: Quadrature points on [-1, 1].
+        wg: Quadrature weights on [-1, 1].
+        n_local: Number of local basis functions, 2 for linear and 3 for quadratic elements.
+        symmetric: Flag indicating that b vanishes at every quadrature point (default False).
+
+    Returns:
+        tuple: Local matrices of shape (N+1, n_local, n_local) and load vectors of shape (N+1, n_local).
+    """
+    n_elements = len(element_h)
+    V_ref, dV_ref = reference_basis(xg)
+    E = np.zeros((n_elements, n_local, n_local))
+    F = np.zeros((n_elements, n_local))
+    for e in prange(n_elements):
+        assemble_element(element_h[e], a_vals[e], b_vals[e], c_vals[e], f_vals[e], V_ref, dV_ref, wg,
+                         symmetric, E[e], F[e])
+    return E, F
+
+def _warm_up():
+    """Compile, or load from the Numba cache, the assembly kernels for the argument types used by the solver."""
+    element_h = np.full(2, 0.5)
+    vals = np.ones((2, 3))
+    xg, wg = np.polynomial.legendre.leggauss(3)
+    # n_local and symmetric are runtime values, so one call covers linear and quadratic elements
+    assemble(element_h, vals, vals, vals, vals, xg, wg, 3, False)
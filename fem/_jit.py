@@ -0,0 +1,16 @@
+"""Optional Numba support for the numerical kernels.
+
+Numba is an optional dependency. When it is not installed, 'njit' leaves the decorated
+functions untouched so that they run as plain Python and 'prange' is the builtin range.
+"""
+
+try:
+    from numba import njit, prange
+except ImportError:
+    prange = range
+
+    def njit(*args, **kwargs):
+        """Fallback decorator returning the function unchanged when Numba is unavailable."""
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
@@ -5,14 +5,28 @@ the finite element method (FEM). The linear function, phi, represents the linear
 while the quadratic function, psi, represents the quadratic piecewise affine basis functions.
 """
 
-import logging
-import os
+import numpy as np
+from ._jit import njit
+from .mesh import Mesh
 
-# Set up logging
-handler = logging.StreamHandler()
-logger = logging.getLogger(__name__)
-logger.setLevel(os.environ.get("LOGLEVEL", "INFO"))
-logger.addHandler(handler)
+def _validate_index(i, lowest, highest):
+    """
+    Check that a basis function index is an integer within its admissible range.
+
+    Args:
+        i (int): Basis function index.
+        lowest (int): Smallest admissible index.
+        highest (int): Largest admissible index.
+
+    Raises:
+        TypeError: If 'i' is not an integer.
+        ValueError: If 'i' is not between lowest and highest.
+    """
+    if not isinstance(i, int):
+        raise TypeError(f"Variable 'i' must be an integer, got {i}")
+
+    if not lowest <= i <= highest:
+        raise ValueError(f"Variable 'i' must be an integer between {lowest} and {highest}, got {i}")
 
 def phi(i, x, nodes, deriv=False):
     """
@@ -20,62 +34,102 @@ def phi(i, x, nodes, deriv=False):
 
     Args:
         i (int): Integer between 0 and N+1 indicating the basis function index.
-        x (float): Real number between 0 and 1 representing the evaluation point.
-        nodes (list of float): List of nodal points.
+        x (float or np.ndarray): Real number between 0 and 1 representing the evaluation point.
+            Arrays are evaluated by phi_eval, in closed form on uniform meshes.
+        nodes (Mesh or np.ndarray): Finite element mesh, or its array of nodal points. Passing a Mesh
+            avoids rebuilding it on every call.
         deriv (bool): Indicates whether to return the basis function or its derivative (default is False).
 
     Returns:
-        float: Value of the basis function or its derivative at x.
+        float or np.ndarray: Value of the basis function or its derivative at x.
 
     Raises:
         TypeError: If 'i' is not an integer.
         ValueError: If 'i' is not between 0 and N+1.
     """
-    try:
-        N = len(nodes) - 2
-        h = 1 / (N + 1)
-
-        if not isinstance(i, int):
-            raise TypeError(f"Variable 'i' must be an integer, got {i}")
-
-        if not 0 <= i <= N + 1:
-            raise ValueError(f"Variable 'i' must be an integer between 0 and {N + 1}, got {i}")
-
-        if not deriv:
-            if i == 0:
-                if nodes[0] <= x <= nodes[1]:
-                    return 1 - (x - nodes[i]) / h
-                return 0
-            if i == N + 1:
-                if nodes[-2] <= x <= nodes[-1]:
-                    return 1 + (x - nodes[i]) / h
-                return 0
-            if nodes[i - 1] <= x <= nodes[i]:
-                return 1 + (x - nodes[i]) / h
-            if nodes[i] < x <= nodes[i + 1]:
-                return 1 - (x - nodes[i]) / h
-            return 0
-
-        if i == 0:
-            if nodes[0] <= x <= nodes[1]:
-                return -1 / h
-            return 0
-        if i == N + 1:
-            if nodes[-2] <= x <= nodes[-1]:
-                return 1 / h
-            return 0
-        if nodes[i - 1] <= x <= nodes[i]:
-            return 1 / h
-        if nodes[i] < x <= nodes[i + 1]:
-            return -1 / h
-        return 0
-
-    except TypeError as err:
-        logger.error("TypeError: %s", err)
-    except ValueError as err:
-        logger.error("ValueError: %s", err)
-    except Exception as err:
-        logger.error("Error: %s", err)
+    mesh = nodes if isinstance(nodes, Mesh) else Mesh(nodes)
+    _validate_index(i, 0, mesh.N + 1)
+    return phi_eval(i, x, mesh, deriv=deriv)
+
+def phi_eval(i, x, mesh, deriv=False):
+    """
+    Linear piecewise affine function finite element basis without argument validation.
+
+    Hot path for callers that have already checked 'i' with _validate_index.
+
+    Args:
+        i (int): Integer between 0 and N+1 indicating the basis function index.
+        x (float or np.ndarray): Evaluation point(s) between 0 and 1.
+        mesh (Mesh): Finite element mesh providing the nodes, h and N.
+        deriv (bool): Indicates whether to return the basis function or its derivative (default is False).
+
+    Returns:
+        float or np.ndarray: Value of the basis function or its derivative at x.
+    """
+    if isinstance(x, np.ndarray):
+        if mesh.uniform:
+            return phi_uniform(i, x, mesh.h, deriv=deriv)
+        return phi_vec(i, x, mesh.nodes, deriv=deriv)
+    return _phi_core(i, x, mesh.nodes, mesh.h, mesh.N, deriv)
+
+@njit(cache=True, fastmath=True)
+def _phi_core(i, x, nodes, h, N, deriv):
+    """Compiled scalar kernel of phi, assuming a valid index 'i' and a float64 'nodes' array."""
+    if i > 0 and nodes[i - 1] <= x <= nodes[i]:
+        return 1.0 / h if deriv else 1.0 + (x - nodes[i]) / h
+    if i < N + 1 and (nodes[i] < x or (i == 0 and nodes[i] <= x)) and x <= nodes[i + 1]:
+        return -1.0 / h if deriv else 1.0 - (x - nodes[i]) / h
+    return 0.0
+
+def phi_vec(i, x, nodes, deriv=False):
+    """
+    Linear piecewise affine function finite element basis evaluated over an array of points.
+
+    Args:
+        i (int): Integer between 0 and N+1 indicating the basis function index.
+        x (array_like): Evaluation points between 0 and 1.
+        nodes (np.ndarray): Array of nodal points.
+        deriv (bool): Indicates whether to return the basis function or its derivative (default is False).
+
+    Returns:
+        np.ndarray: Values of the basis function or its derivative at each point of x.
+    """
+    x = np.asarray(x, dtype=float)
+    N = len(nodes) - 2
+    h = 1 / (N + 1)
+
+    # The boundary basis functions only have one half of the hat
+    left = nodes[i - 1] if i > 0 else nodes[i]
+    mid = nodes[i]
+    right = nodes[i + 1] if i < N + 1 else nodes[i]
+
+    on_left = (x >= left) & (x <= mid) & (i > 0)
+    on_right = (x >= mid if i == 0 else x > mid) & (x <= right)
+
+    if not deriv:
+        return np.where(on_left, 1 + (x - mid) / h, np.where(on_right, 1 - (x - mid) / h, 0.0))
+    return np.where(on_left, 1 / h, np.where(on_right, -1 / h, 0.0))
+
+def phi_uniform(i, x, h, deriv=False):
+    """
+    Linear piecewise affine function finite element basis on a uniform mesh, in branchless closed form.
+
+    On the nodes x_j = j*h the hat function is phi_i(x) = max(0, 1 - |x/h - i|). At a node the
+    derivative takes the same one-sided value as phi.
+
+    Args:
+        i (int): Integer between 0 and N+1 indicating the basis function index.
+        x (float or np.ndarray): Evaluation point(s) between 0 and 1.
+        h (float): Mesh size.
+        deriv (bool): Indicates whether to return the basis function or its derivative (default is False).
+
+    Returns:
+        float or np.ndarray: Value of the basis function or its derivative at x.
+    """
+    t = x / h - i
+    if not deriv:
+        return np.maximum(0.0, 1.0 - np.abs(t))
+    return np.where((t <= 0) & (i > 0), 1 / h, -1 / h) * (np.abs(t) <= 1)
 
 def psi(i, x, nodes, deriv=False):
     """
@@ -83,39 +137,110 @@ def psi(i, x, nodes, deriv=False):
 
     Args:
         i (int): Integer between 1 and N+1 indicating the basis function index.
-        x (float): Real number between 0 and 1 representing the evaluation point.
-        nodes (list of float): List of nodal points.
+        x (float or np.ndarray): Real number between 0 and 1 representing the evaluation point.
+            Arrays are evaluated elementwise by psi_eval.
+        nodes (Mesh or np.ndarray): Finite element mesh, or its array of nodal points. Passing a Mesh
+            avoids rebuilding it on every call.
         deriv (bool): Indicates whether to return the basis function or its derivative (default is False).
 
     Returns:
-        float: Value of the basis function or its derivative at x.
+        float or np.ndarray: Value of the basis function or its derivative at x.
 
     Raises:
         TypeError: If 'i' is not an integer.
         ValueError: If 'i' is not between 1 and N+1.
     """
-    try:
-        N = len(nodes) - 2
+    mesh = nodes if isinstance(nodes, Mesh) else Mesh(nodes)
+    _validate_index(i, 1, mesh.N + 1)
+    return psi_eval(i, x, mesh, deriv=deriv)
 
-        if not isinstance(i, int):
-            raise TypeError(f"Variable 'i' must be an integer, got {i}")
+def psi_eval(i, x, mesh, deriv=False):
+    """
+    Quadratic piecewise affine function finite element basis without argument validation.
 
-        if not 1 <= i <= N + 1:
-            raise ValueError(f"Variable 'i' must be an integer between 1 and {N + 1}, got {i}")
+    Hot path for callers that have already checked 'i' with _validate_index.
 
-        if not deriv:
-            if nodes[i - 1] <= x <= nodes[i]:
-                return (x - nodes[i - 1]) * (x - nodes[i]) / 2
-            return 0
+    Args:
+        i (int): Integer between 1 and N+1 indicating the basis function index.
+        x (float or np.ndarray): Evaluation point(s) between 0 and 1.
+        mesh (Mesh): Finite element mesh providing the nodes.
+        deriv (bool): Indicates whether to return the basis function or its derivative (default is False).
 
-        if nodes[i - 1] <= x <= nodes[i]:
-            return x - (nodes[i - 1] + nodes[i]) / 2
+    Returns:
+        float or np.ndarray: Value of the basis function or its derivative at x.
+    """
+    if isinstance(x, np.ndarray):
+        return psi_vec(i, x, mesh.nodes, deriv=deriv)
+    return _psi_core(i, x, mesh.nodes, deriv)
 
-        return 0
+def psi_vec(i, x, nodes, deriv=False):
+    """
+    Quadratic piecewise affine function finite element basis evaluated over an array of points.
+
+    Args:
+        i (int): Integer between 1 and N+1 indicating the basis function index.
+        x (array_like): Evaluation points between 0 and 1.
+        nodes (np.ndarray): Array of nodal points.
+        deriv (bool): Indicates whether to return the basis function or its derivative (default is False).
+
+    Returns:
+        np.ndarray: Values of the basis function or its derivative at each point of x.
+    """
+    x = np.asarray(x, dtype=float)
+    a = nodes[i - 1]
+    b = nodes[i]
+    on_element = (x >= a) & (x <= b)
+
+    if deriv:
+        return np.where(on_element, x - 0.5 * (a + b), 0.0)
+    t = x - a
+    return np.where(on_element, 0.5 * (t * x - t * b), 0.0)
+
+@njit(cache=True, fastmath=True)
+def _psi_core(i, x, nodes, deriv):
+    """Compiled scalar kernel of psi, assuming a valid index 'i' and a float64 'nodes' array."""
+    a = nodes[i - 1]
+    b = nodes[i]
+    if a <= x <= b:
+        if deriv:
+            return x - 0.5 * (a + b)
+        # (x - a)(x - b)/2 rearranged so that it compiles to fused multiply-adds
+        t = x - a
+        return 0.5 * (t * x - t * b)
+    return 0.0
+
+def eval_fe_solution(U, x_array, nodes, poly_order=0):
+    """
+    Evaluate a finite element function over an array of points.
 
-    except TypeError as err:
-        logger.error("TypeError: %s", err)
-    except ValueError as err:
-        logger.error("ValueError: %s", err)
-    except Exception as err:
-        logger.error("Error: %s", err)
+    Each point is located in its element with a binary search, so only the two hat functions and
+    the bubble function of that element are evaluated.
+
+    Args:
+        U (np.ndarray): Coefficients of the N+2 hat functions phi_0, ..., phi_{N+1}, followed for
+            quadratic elements by those of the N+1 bubble functions psi_1, ..., psi_{N+1}.
+        x_array (array_like): Evaluation points between 0 and 1.
+        nodes (np.ndarray): Array of nodal points.
+        poly_order (int): Polynomial order of the basis functions (default 0 for linear and 1 for quadratic).
+
+    Returns:
+        np.ndarray: Values of the finite element function at each point of x_array.
+    """
+    x = np.asarray(x_array, dtype=float)
+    N = len(nodes) - 2
+    e = np.clip(np.searchsorted(nodes, x, side='right') - 1, 0, N)
+    a = nodes[e]
+    b = nodes[e + 1]
+    xi = (x - a) / (b - a)
+
+    u = U[e] * (1 - xi) + U[e + 1] * xi
+    if poly_order:
+        u += U[N + 2 + e] * 0.5 * (x - a) * (x - b)
+    return u
+
+def _warm_up():
+    """Compile, or load from the Numba cache, the scalar kernels for the argument types used by the solver."""
+    nodes = np.array([0.0, 0.5, 1.0])
+    for deriv in (False, True):
+        _phi_core(0, 0.5, nodes, 0.5, 1, deriv)
+        _psi_core(1, 0.25, nodes, deriv)
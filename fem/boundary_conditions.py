@@ -9,11 +9,84 @@ Classes:
     RobinBC: Base class for Robin boundary conditions.
     LeftRobinBC: Implements the left Robin boundary condition.
     RightRobinBC: Implements the right Robin boundary condition.
+
+Functions:
+    gather_boundary_terms: Sum the contributions of a list of boundary conditions at each boundary.
+    apply_all: Apply a list of boundary conditions to a dense stress matrix and load vector (deprecated).
 """
 
-import sympy as sp
-from .basis_functions import phi
-from .printer import display_equation
+import warnings
+import numpy as np
+from ._assemble_numba import assemble
+
+def _boundary_element_matrices(ode, mesh):
+    """Compute the local stress matrices of the first and last element of the mesh.
+
+    Args:
+        ode: Object representing the ordinary differential equation.
+        mesh: Finite element mesh.
+
+    Returns:
+        np.ndarray: Local matrices of shape (2, 2, 2), indexed (element, test, trial).
+    """
+    xg, wg = np.polynomial.legendre.leggauss(3)
+    element_h = mesh.element_h[[0, -1]]
+    lower = mesh.element_left[[0, -1], None]
+    X = 0.5*element_h[:, None]*(xg + 1) + lower
+    a_vals, b_vals, c_vals, f_vals = ode.evaluate(X)
+    E, _ = assemble(element_h, a_vals, b_vals, c_vals, f_vals, xg, wg, 2, False)
+    return E
+
+def gather_boundary_terms(bcs, ode, E):
+    """Sum the contributions of a list of boundary conditions at the left and right boundaries.
+
+    Args:
+        bcs: List of boundary condition objects.
+        ode: Object representing the ordinary differential equation.
+        E: Local stress matrices of the elements, shape (N+1, n_local, n_local), indexed (element, test, trial).
+
+    Returns:
+        tuple: Load vector and stress matrix diagonal terms, each an array indexed by boundary side.
+    """
+    rhs_add = np.zeros(2)
+    diag_add = np.zeros(2)
+    for bc in bcs:
+        side, rhs, diag = bc.boundary_terms(ode, E)
+        rhs_add[side] += rhs
+        diag_add[side] += diag
+    return rhs_add, diag_add
+
+def _warn_apply():
+    """Warn that the dense boundary condition application is deprecated."""
+    warnings.warn("Applying boundary conditions to a dense stress matrix is deprecated, FEMSolver.solve "
+                  "takes the boundary terms of each condition directly.", DeprecationWarning, stacklevel=3)
+
+def _apply_all(bcs, f_array, A, ode, mesh, last):
+    """Add the boundary terms of a list of boundary conditions to a dense stress matrix and load vector."""
+    E = _boundary_element_matrices(ode, mesh)
+    rhs_add, diag_add = gather_boundary_terms(bcs, ode, E)
+    corners = np.array([0, last])
+    np.add.at(f_array, corners, rhs_add)
+    np.add.at(A, (corners, corners), diag_add)
+
+def apply_all(bcs, f_array, A, ode, mesh, last):
+    """Apply a list of boundary conditions to the stress matrix and load vector in one update.
+
+    Deprecated, since FEMSolver no longer builds a dense stress matrix. Use FEMSolver.solve instead.
+
+    The contributions of every boundary condition are gathered into two-entry buffers for the
+    first and last linear degrees of freedom, which are then written to f_array and A at once.
+
+    Args:
+        bcs: List of boundary condition objects.
+        f_array: Array representing the load vector.
+        A: Matrix representing the stress matrix.
+        ode: Object representing the ordinary differential equation.
+        mesh: Finite element mesh.
+        last: Final index value of the linear basis functions in the load vector.
+    """
+    _warn_apply()
+    _apply_all(bcs, f_array, A, ode, mesh, last)
 
 class DirichletBC:
     """Base class for Dirichlet boundary conditions.
@@ -25,6 +98,7 @@ class DirichletBC:
     Public Methods:
         __init__(g0=None, g1=None): Initializes the boundary conditions.
         display(): Display the left and right boundary conditions using LaTeX formatting.
+        apply(f_array, A, ode, mesh, last): Apply the boundary condition to the stress matrix and load vector.
     """
     def __init__(self, g0=0, g1=0):
         """Initialize the Dirichlet boundary conditions.
@@ -38,10 +112,27 @@ class DirichletBC:
 
     def display(self):
         """Display the left and right boundary conditions using LaTeX formatting."""
+        import sympy as sp # pylint: disable=C0415
+        from .printer import display_equation # pylint: disable=C0415
         y = sp.Function('y')
         display_equation(y(0), self.leftbc) # pylint: disable=E1102
         display_equation(y(1), self.rightbc) # pylint: disable=E1102
 
+    def apply(self, f_array, A, ode, mesh, last):
+        """Apply the boundary condition to the stress matrix and load vector.
+
+        Deprecated, since FEMSolver no longer builds a dense stress matrix. Use FEMSolver.solve instead.
+        
+        Args:
+            f_array: Array representing the load vector.
+            A: Matrix representing the stress matrix.
+            ode: Object representing the ordinary differential equation.
+            mesh: Finite element mesh.
+            last: Final index value of the linear basis functions in the load vector.
+        """
+        _warn_apply()
+        _apply_all([self], f_array, A, ode, mesh, last)
+
 class LeftDirichletBC(DirichletBC):
     """Implements the left Dirichlet boundary condition.
     
@@ -51,7 +142,7 @@ class LeftDirichletBC(DirichletBC):
     Public Methods:
         __init__(g0): Initializes the left Dirichlet boundary condition.
         display(): Display the left boundary condition using LaTeX formatting.
-        apply(**kwargs): Apply the left boundary condition to the stress matrix and load vector.
+        boundary_terms(ode, E): Compute the left boundary contributions to the stress matrix and load vector.
     """
     def __init__(self, g0):
         """Initialize the left Dirichlet boundary condition.
@@ -63,28 +154,23 @@ class LeftDirichletBC(DirichletBC):
 
     def display(self):
         """Display the left boundary condition using LaTeX formatting."""
+        import sympy as sp # pylint: disable=C0415
+        from .printer import display_equation # pylint: disable=C0415
         y = sp.Function('y')
         display_equation(y(0), self.leftbc) # pylint: disable=E1102
 
-    def apply(self, **kwargs):
-        """Apply the left boundary condition to the stress matrix and load vector.
+    def boundary_terms(self, ode, E): # pylint: disable=W0613
+        """Compute the contributions of the left boundary condition to the stress matrix and load vector.
         
         Args:
-            f_array: Array representing the load vector.
-            poly: Polynomial order for the chosen basis functions. 0 represents linear and 
-                  1 represents quadratic (default is 0).
-            bilinear_form: Bilinear form of the differential equation's weak form.
-        """
-        f_array = kwargs.get("f_array")
-        poly = kwargs.get("poly")
-        bilinear_form = kwargs.get("bilinear_form")
-
-        def u_hat(i,x,nodes,deriv=False):
-            if not deriv:
-                return self.leftbc*phi(0,x,nodes)
-            return self.leftbc*phi(0,x,nodes,deriv=True)
+            ode: Object representing the ordinary differential equation.
+            E: Local stress matrices of the elements, indexed (element, test, trial).
 
-        f_array[0] += -bilinear_form(u_hat,1,poly,1)
+        Returns:
+            tuple: Boundary side (0 for left, 1 for right), load vector and stress matrix diagonal terms.
+        """
+        # The lifting leftbc*phi_0 tested against phi_1 on the first element
+        return 0, -self.leftbc*E[0, 1, 0], 0.0
 
 class RightDirichletBC(DirichletBC):
     """Implements the right Dirichlet boundary condition.
@@ -95,39 +181,30 @@ class RightDirichletBC(DirichletBC):
     Public Methods:
         __init__(g1): Initializes the right Dirichlet boundary condition.
         display(): Display the right boundary condition using LaTeX formatting.
-        apply(**kwargs): Apply the right boundary condition to the stress matrix and load vector.
+        boundary_terms(ode, E): Compute the right boundary contributions to the stress matrix and load vector.
     """
     def __init__(self, g1):
         super().__init__(g1=g1)
 
     def display(self):
         """Display the right boundary condition using LaTeX formatting."""
+        import sympy as sp # pylint: disable=C0415
+        from .printer import display_equation # pylint: disable=C0415
         y = sp.Function('y')
         display_equation(y(1), self.rightbc) # pylint: disable=E1102 
 
-    def apply(self, **kwargs):
-        """Apply the right boundary condition to the stress matrix and load vector.
+    def boundary_terms(self, ode, E): # pylint: disable=W0613
+        """Compute the contributions of the right boundary condition to the stress matrix and load vector.
         
         Args:
-            N: Number of elements.
-            f_array: Array representing the load vector.
-            poly: Polynomial order for the chosen basis functions. 0 represents linear and 
-                  1 represents quadratic (default is 0).
-            last: Final index value of the linear basis functions in the load vector.
-            bilinear_form: Bilinear form of the differential equation's weak form.
-        """
-        N = kwargs.get("N")
-        f_array = kwargs.get("f_array")
-        poly = kwargs.get("poly")
-        last = kwargs.get("last")
-        bilinear_form = kwargs.get("bilinear_form")
-
-        def u_hat(i,x,nodes,deriv=False):
-            if not deriv:
-                return self.rightbc*phi(N+1, x, nodes)
-            return self.rightbc*phi(N+1, x, nodes, deriv=True)
+            ode: Object representing the ordinary differential equation.
+            E: Local stress matrices of the elements, indexed (element, test, trial).
 
-        f_array[last] += -bilinear_form(u_hat, N, poly, N)
+        Returns:
+            tuple: Boundary side (0 for left, 1 for right), load vector and stress matrix diagonal terms.
+        """
+        # The lifting rightbc*phi_{N+1} tested against phi_N on the last element
+        return 1, -self.rightbc*E[-1, 0, 1], 0.0
 
 class RobinBC:
     """Base class for Robin boundary conditions.
@@ -139,6 +216,7 @@ class RobinBC:
     Public Methods:
         __init__(g0=None, g1=None): Initializes the boundary conditions.
         display(): Display the left and right boundary conditions using LaTeX formatting.
+        apply(f_array, A, ode, mesh, last): Apply the boundary condition to the stress matrix and load vector.
     """
     def __init__(self, g0=0, g1=0, beta=0):
         """Initialize the Dirichlet boundary conditions.
@@ -154,6 +232,8 @@ class RobinBC:
 
     def display(self):
         """Display the left and right boundary conditions using LaTeX formatting."""
+        import sympy as sp # pylint: disable=C0415
+        from .printer import display_equation # pylint: disable=C0415
         x = sp.symbols('x')
         y = sp.Function('y')(x) # pylint: disable=E1102
         lhs_left = -sp.diff(y, x).subs(x, 0) + self.beta*y.subs(x, 0)
@@ -161,6 +241,21 @@ class RobinBC:
         lhs_right = sp.diff(y, x).subs(x, 1) + self.beta*y.subs(x, 1)
         display_equation(lhs_right, self.rightbc)
 
+    def apply(self, f_array, A, ode, mesh, last):
+        """Apply the boundary condition to the stress matrix and load vector.
+
+        Deprecated, since FEMSolver no longer builds a dense stress matrix. Use FEMSolver.solve instead.
+        
+        Args:
+            f_array: Array representing the load vector.
+            A: Matrix representing the stress matrix.
+            ode: Object representing the ordinary differential equation.
+            mesh: Finite element mesh.
+            last: Final index value of the linear basis functions in the load vector.
+        """
+        _warn_apply()
+        _apply_all([self], f_array, A, ode, mesh, last)
+
 class LeftRobinBC(RobinBC):
     """Implements the left Robin boundary condition.
     
@@ -171,7 +266,7 @@ class LeftRobinBC(RobinBC):
     Public Methods:
         __init__(g0, beta=0): Initializes the left Robin boundary condition.
         display(): Display the left boundary condition using LaTeX formatting.
-        apply(**kwargs): Apply the left boundary condition to the stress matrix and load vector.
+        boundary_terms(ode, E): Compute the left boundary contributions to the stress matrix and load vector.
     """
     def __init__(self, g0, beta=0):
         """Initialize the left Robin boundary condition.
@@ -184,25 +279,25 @@ class LeftRobinBC(RobinBC):
 
     def display(self):
         """Display the left boundary condition using LaTeX formatting."""
+        import sympy as sp # pylint: disable=C0415
+        from .printer import display_equation # pylint: disable=C0415
         x = sp.symbols('x')
         y = sp.Function('y')(x) # pylint: disable=E1102
         lhs = -sp.diff(y, x).subs(x, 0) + self.beta*y.subs(x, 0)
         display_equation(lhs, -1*self.leftbc)
 
-    def apply(self, **kwargs):
-        """Apply the right boundary condition to the stress matrix and load vector.
+    def boundary_terms(self, ode, E): # pylint: disable=W0613
+        """Compute the contributions of the left boundary condition to the stress matrix and load vector.
         
         Args:
-            f_array: Array representing the load vector.
-            A: Matrix representing the stress matrix.
             ode: Object representing the ordinary differential equation.
-        """
-        f_array = kwargs.get("f_array")
-        A = kwargs.get("A")
-        ode = kwargs.get("ode")
+            E: Local stress matrices of the elements, indexed (element, test, trial).
 
-        A[0,0] += -ode.a(0)*self.beta
-        f_array[0] += ode.a(0)*self.leftbc
+        Returns:
+            tuple: Boundary side (0 for left, 1 for right), load vector and stress matrix diagonal terms.
+        """
+        a0 = ode.a(0)
+        return 0, a0*self.leftbc, -a0*self.beta
 
 class RightRobinBC(RobinBC):
     """Right Robin Boundary Condition
@@ -223,24 +318,22 @@ class RightRobinBC(RobinBC):
 
     def display(self):
         """Display the left boundary condition using LaTeX formatting."""
+        import sympy as sp # pylint: disable=C0415
+        from .printer import display_equation # pylint: disable=C0415
         x = sp.symbols('x')
         y = sp.Function('y')(x) # pylint: disable=E1102
         lhs = sp.diff(y, x).subs(x, 1) + self.beta*y.subs(x, 1)
         display_equation(lhs, self.rightbc)
 
-    def apply(self, **kwargs):
-        """Apply the right boundary condition to the stress matrix and load vector.
+    def boundary_terms(self, ode, E): # pylint: disable=W0613
+        """Compute the contributions of the right boundary condition to the stress matrix and load vector.
         
         Args:
-            f_array: Array representing the load vector.
-            A: Matrix representing the stress matrix.
             ode: Object representing the ordinary differential equation.
-            last: Final index value of the linear basis functions in the load vector.
-        """
-        f_array = kwargs.get("f_array")
-        A = kwargs.get("A")
-        ode = kwargs.get("ode")
-        last = kwargs.get("last")
+            E: Local stress matrices of the elements, indexed (element, test, trial).
 
-        A[last,last] += -ode.a(1)*self.beta
-        f_array[last] += -ode.a(1)*self.rightbc
+        Returns:
+            tuple: Boundary side (0 for left, 1 for right), load vector and stress matrix diagonal terms.
+        """
+        a1 = ode.a(1)
+        return 1, -a1*self.rightbc, -a1*self.beta
@@ -6,15 +6,43 @@ the finite element method.
 """
 
 import numpy as np
-import matplotlib.pyplot as plt
-from scipy import integrate
-from .boundary_conditions import LeftDirichletBC, RightDirichletBC
-from .basis_functions import phi, psi
+from scipy import sparse
+from scipy.linalg import LinAlgError, cho_solve_banded, cholesky_banded
+from scipy.sparse.linalg import splu
+from .boundary_conditions import LeftDirichletBC, RightDirichletBC, gather_boundary_terms
+from .basis_functions import eval_fe_solution
+from ._assemble_numba import assemble
+from .mesh import Mesh, make_nodes
+
+def _factorize_banded(ab, symmetric):
+    """Factorize a tridiagonal stress matrix given in LAPACK banded storage.
+
+    A symmetric matrix is either positive or negative definite depending on the sign of a, so it is
+    negated if needed and factorized with a banded Cholesky decomposition. Indefinite and
+    nonsymmetric matrices are factorized with a sparse LU decomposition.
+
+    Args:
+        ab: Stress matrix in LAPACK banded storage, shape (3, k), where row 1 + i - j holds A[i, j].
+        symmetric: Flag indicating that the stress matrix is symmetric.
+
+    Returns:
+        function: Solver mapping a load vector to the solution of the system.
+    """
+    if symmetric:
+        sign = -1.0 if ab[1, 0] < 0 else 1.0
+        try:
+            cb = cholesky_banded(sign*ab[:2], check_finite=False)
+            return lambda f_array: cho_solve_banded((cb, False), sign*f_array, check_finite=False)
+        except LinAlgError:
+            pass
+    A = sparse.diags([ab[2, :-1], ab[1], ab[0, 1:]], [-1, 0, 1], format="csc")
+    return splu(A).solve
 
 class FEMSolver:
     """Solver for Differential Equations using Finite Element Method
     
     Attributes:
+        mesh: Finite element mesh of [0, 1] with N interior nodes.
         nodes: Array of nodes for the finite element mesh.
         quadratic: Quadratic term used in calculations.
         is_left_dirichlet: Flag indicating if the left boundary condition is Dirichlet.
@@ -22,6 +50,15 @@ class FEMSolver:
         start_range: Start index for the linear range.
         linear_end_range: End index for the linear range.
         linear_range: Range of linear elements.
+        k: Number of unknowns of the linear system.
+        element_dof_map: Global dofs of the local basis functions of every element, shape (N+1, n_local),
+            with -1 for eliminated Dirichlet nodes.
+        _U: Coefficients of the last computed solution, reused by plot_solution.
+        _solved: Flag indicating if _U holds the solution of the current problem.
+        _A_factor: Cached factorization of the stress matrix, as a function of the load vector.
+        _f_array: Cached load vector.
+        xg: Gauss-Legendre quadrature points on [-1, 1].
+        wg: Gauss-Legendre quadrature weights on [-1, 1].
     """
     def __init__(self, ode, leftbc, rightbc, poly_order=0, N=9):
         """Initialize FEMSolver
@@ -40,13 +77,115 @@ class FEMSolver:
         self.poly_order = poly_order # 0 for linear and 1 for quadratic
         self.N = N
 
-        self.nodes = np.linspace(0, 1, self.N + 2)
+        self._setup()
+        # Three point Gauss-Legendre rule on [-1, 1], exact for quadratic times quadratic integrands
+        self.xg, self.wg = np.polynomial.legendre.leggauss(3)
+        self._A_factor = None
+        self._f_array = None
+        self._U = None
+        self._solved = False
+
+    def _setup(self):
+        """Derive the mesh, dof layout and sparsity pattern from N, poly_order and the boundary conditions."""
+        self.mesh = Mesh(make_nodes(self.N))
+        self.nodes = self.mesh.nodes
         self.quadratic = self.poly_order * (self.N + 1)
         self.is_left_dirichlet = isinstance(self.leftbc, LeftDirichletBC)
         self.is_right_dirichlet = isinstance(self.rightbc, RightDirichletBC)
         self.start_range = 1 if self.is_left_dirichlet else 0
         self.linear_end_range = self.N + 1 if self.is_right_dirichlet else self.N + 2
         self.linear_range = range(self.start_range, self.linear_end_range)
+        self.k = len(self.linear_range) + self.quadratic
+        self.element_dof_map = self._element_dofs()
+        self._pattern = self._band_pattern()
+
+    def _element_dofs(self):
+        """Global dofs of the local basis functions of each element.
+
+        The hat functions come first and eliminated Dirichlet nodes get the index -1. The bubble of
+        element e is psi_{e+1}.
+
+        Returns:
+            Array: Integer array of shape (N+1, 2) for linear and (N+1, 3) for quadratic elements.
+        """
+        n_linear = len(self.linear_range)
+        linear_dofs = np.arange(self.N + 2) - self.start_range
+        linear_dofs[(linear_dofs < 0) | (linear_dofs >= n_linear)] = -1
+        dofs = np.empty((self.N + 1, 3 if self.quadratic else 2), dtype=int)
+        dofs[:, 0], dofs[:, 1] = linear_dofs[:-1], linear_dofs[1:]
+        if self.quadratic:
+            dofs[:, 2] = n_linear + np.arange(self.N + 1)
+        return dofs
+
+    def _band_pattern(self):
+        """Locate the entries of the local stress matrices in the banded storage of A.
+
+        Every linear dof is coupled to its neighbours. The bubble-hat entries, such as the mass term
+        of c*phi*psi, are nonzero but deliberately left out to match the baseline discretisation, so
+        every bubble is only coupled to itself. This is what keeps A tridiagonal, with A[i, j] stored
+        in row 1 + i - j and column j.
+
+        Returns:
+            tuple: Mask of the flattened local matrix entries that enter A, and their rows and
+            columns in the banded storage.
+        """
+        dofs = self.element_dof_map
+        n_local = dofs.shape[1]
+        Ig = np.repeat(dofs, n_local, axis=1).ravel()
+        Jg = np.tile(dofs, (1, n_local)).ravel()
+        # Drop the bubble-hat entries of each element, which keeps A tridiagonal
+        coupled = np.ones((n_local, n_local), dtype=bool)
+        coupled[2:, :2] = coupled[:2, 2:] = False
+        keep = (Ig >= 0) & (Jg >= 0) & np.tile(coupled.ravel(), self.N + 1)
+        return keep, 1 + Ig[keep] - Jg[keep], Jg[keep]
+
+    def factorize(self):
+        """Assemble and factorize the stress matrix, and assemble the load vector.
+
+        The factorization and load vector are cached, so that subsequent calls to solve only perform
+        the triangular solves. Call invalidate after changing the ODE, the boundary conditions, N or
+        poly_order.
+        """
+        n_linear = len(self.linear_range)
+        n_local = self.element_dof_map.shape[1]
+        f_array = np.zeros(self.k)
+
+        # Coefficients at the quadrature points of every element, shape (N+1, nq)
+        lower, upper = self.mesh.element_left[:, None], self.mesh.element_right[:, None]
+        X = 0.5*self.mesh.element_h[:, None]*self.xg + 0.5*(upper + lower)
+        a_vals, b_vals, c_vals, f_vals = self.ode.evaluate(X)
+
+        # Without the advection term the stress matrix is symmetric
+        symmetric = not np.any(b_vals)
+        E, F = assemble(self.mesh.element_h, a_vals, b_vals, c_vals, f_vals, self.xg, self.wg, n_local,
+                        symmetric)
+
+        dofs = self.element_dof_map
+        keep = dofs >= 0
+        np.add.at(f_array, dofs[keep], F[keep])
+        keep, rows, cols = self._pattern
+        ab = np.zeros((3, self.k))
+        np.add.at(ab, (rows, cols), E.ravel()[keep])
+
+        # Boundary conditions only touch the first and last linear dofs
+        corners = np.array([0, n_linear - 1])
+        rhs_add, diag_add = gather_boundary_terms([self.leftbc, self.rightbc], self.ode, E)
+        np.add.at(f_array, corners, rhs_add)
+        np.add.at(ab[1], corners, diag_add)
+
+        self._A_factor = _factorize_banded(ab, symmetric)
+        self._f_array = f_array
+
+    def invalidate(self):
+        """Rebuild the state derived from the problem setup and drop the cached factorization and solution.
+
+        Call after changing the ODE, the boundary conditions, N or poly_order.
+        """
+        self._setup()
+        self._A_factor = None
+        self._f_array = None
+        self._U = None
+        self._solved = False
 
     def solve(self):
         """Solve the differential equation using Finite Element Method
@@ -55,68 +194,29 @@ class FEMSolver:
             Array: Solution to the linear system containing stress matrix A and load vector f
         
         """
-        k = self.N + 2 + self.quadratic
-        k -= int(self.is_left_dirichlet) + int(self.is_right_dirichlet)
-
-        quadratic_range = range(self.start_range, self.linear_end_range + self.quadratic)
-
-        def bilinear_form(u,i,v,j):
-            return integrate.quad(lambda x: -1*self.ode.a(x)*u(i,x,self.nodes,deriv=True)*v(j,x,self.nodes,deriv=True) 
-                                  + self.ode.b(x)*u(i,x,self.nodes,deriv=True)*v(j,x,self.nodes) 
-                                  + self.ode.c(x)*u(i,x,self.nodes)*v(j,x,self.nodes), 0, 1)[0]
-
-        def linear_functional(v,i):
-            return integrate.quad(lambda x: self.ode.f(x)*v(i,x, self.nodes), 0, 1)[0]
-
-        def sigma(i, x, nodes, deriv=False):
-            if i < self.linear_end_range:
-                return phi(i, x, nodes, deriv=deriv)
-            return psi(i + 1 - self.linear_end_range, x, nodes, deriv=deriv)
-
-        A = np.zeros((k, k))
-        f_array = np.empty(k)
-
-        for index, i in enumerate(quadratic_range):
-            A[index, index] = bilinear_form(sigma, i, sigma, i)
-            if index < len(quadratic_range) - 1:
-                A[index, index + 1] = bilinear_form(sigma, i + 1, sigma, i)
-                A[index + 1, index] = bilinear_form(sigma, i, sigma, i + 1)
-            f_array[index] = linear_functional(sigma, i)
-
-        apply_kwargs = {
-            "N": self.N,
-            "nodes": self.nodes,
-            "f_array": f_array,
-            "A": A,
-            "ode": self.ode,
-            "poly": sigma,
-            "last": len(self.linear_range) - 1,
-            "bilinear_form": bilinear_form
-        }
-
-        self.leftbc.apply(**apply_kwargs)
-        self.rightbc.apply(**apply_kwargs)
-
-        U = np.linalg.solve(A, f_array)
+        if self._A_factor is None:
+            self.factorize()
+        U = self._A_factor(self._f_array)
+        self._U = U
+        self._solved = True
         return U
 
     def plot_solution(self):
         """Plot the solution obtained from solving the differential equation"""
+        import matplotlib.pyplot as plt # pylint: disable=C0415
+
+        U = self._U if self._solved else self.solve()
 
-        U = self.solve()
-
-        def u_h(x):
-            approx = 0
-            for index, i in enumerate(self.linear_range):
-                approx += U[index] * phi(i, x, self.nodes)
-            if self.quadratic != 0:
-                for i in range(1, self.N + 2):
-                    approx += U[len(self.linear_range) + i - 1] * psi(i, x, self.nodes)
-            if self.is_left_dirichlet:
-                approx += self.leftbc.leftbc * phi(0, x, self.nodes)
-            if self.is_right_dirichlet:
-                approx += self.rightbc.rightbc * phi(self.N + 1, x, self.nodes)
-            return approx
+        # Coefficients of all hat functions, including the Dirichlet boundary values, then the bubbles
+        n_linear = len(self.linear_range)
+        coefficients = np.zeros(self.N + 2 + self.quadratic)
+        coefficients[self.start_range:self.linear_end_range] = U[:n_linear]
+        coefficients[self.N + 2:] = U[n_linear:]
+        if self.is_left_dirichlet:
+            coefficients[0] = self.leftbc.leftbc
+        if self.is_right_dirichlet:
+            coefficients[self.N + 1] = self.rightbc.rightbc
 
         xes = np.linspace(0,1,200)
-        plt.plot(xes, [u_h(x) for x in xes], label = "FE Solution")
+        u_h = eval_fe_solution(coefficients, xes, self.nodes, self.poly_order)
+        plt.plot(xes, u_h, label = "FE Solution")
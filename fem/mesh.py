@@ -0,0 +1,42 @@
+"""Finite Element Mesh
+
+This module provides a class 'Mesh' holding the nodal points of a one-dimensional finite element
+mesh of [0, 1] together with the quantities derived from them, so that they are computed once
+rather than on every basis function evaluation.
+"""
+
+import numpy as np
+
+def make_nodes(N):
+    """Return the N+2 equally spaced nodal points of [0, 1] as a contiguous float64 array.
+
+    Args:
+        N: Number of interior nodes.
+    """
+    return np.linspace(0, 1, N + 2)
+
+class Mesh:
+    """One-dimensional finite element mesh of [0, 1].
+
+    Attributes:
+        nodes: Contiguous float64 array of nodal points, including both boundary nodes.
+        N: Number of interior nodes.
+        h: Mesh size 1/(N+1).
+        uniform: Whether the nodes are equally spaced, allowing closed form basis evaluations.
+        element_left: Left end of every element, shape (N+1,).
+        element_right: Right end of every element, shape (N+1,).
+        element_h: Width of every element, shape (N+1,).
+    """
+    def __init__(self, nodes):
+        """Initialize the mesh.
+
+        Args:
+            nodes: Nodal points of the mesh, including both boundary nodes.
+        """
+        self.nodes = np.ascontiguousarray(nodes, dtype=np.float64)
+        self.N = len(self.nodes) - 2
+        self.h = 1 / (self.N + 1)
+        self.element_left = self.nodes[:-1]
+        self.element_right = self.nodes[1:]
+        self.element_h = np.diff(self.nodes)
+        self.uniform = bool(np.allclose(self.element_h, self.h))
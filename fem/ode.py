@@ -3,8 +3,29 @@
 This module provides a class 'ODE' to define and display ordinary differential equations (ODEs).
 """
 
-import sympy as sp
-from .printer import display_equation
+import sys
+import numpy as np
+
+def _lambdify(term):
+    """Compile a sympy expression in x into a NumPy callable, leaving functions untouched."""
+    # A sympy expression can only have been built if sympy is already imported
+    sp = sys.modules.get("sympy")
+    if sp is not None and isinstance(term, sp.Expr):
+        return sp.lambdify(sp.symbols('x'), term, "numpy")
+    return term
+
+def _vectorize(term):
+    """Wrap a coefficient function so that it can be evaluated on arrays of points.
+
+    Functions written for scalars, for example using the math module or an if statement on x,
+    raise on arrays and are then evaluated pointwise with np.vectorize.
+    """
+    def evaluate(x):
+        try:
+            return term(x)
+        except (TypeError, ValueError):
+            return np.vectorize(term, otypes=[float])(x)
+    return evaluate
 
 class ODE:
     """Ordinary Differential Equation (ODE)
@@ -12,6 +33,9 @@ class ODE:
     This class represents an ordinary differential equation of the form:
     a(x) * y''(x) + b(x) * y'(x) + c(x) * y(x) = f(x).
 
+    The coefficients may also be given as sympy expressions in the symbol x, in which case
+    they are compiled once into NumPy callables.
+
     Attributes:
         a (function): Coefficient function for y''(x).
         b (function): Coefficient function for y'(x).
@@ -23,22 +47,62 @@ class ODE:
         Initialize the ODE with given coefficient functions.
 
         Args:
-            a (function): Coefficient function for y''(x).
-            b (function): Coefficient function for y'(x).
-            c (function): Coefficient function for y(x).
-            f (function): Right-hand side function of the ODE.
+            a (function or sympy.Expr): Coefficient function for y''(x).
+            b (function or sympy.Expr): Coefficient function for y'(x).
+            c (function or sympy.Expr): Coefficient function for y(x).
+            f (function or sympy.Expr): Right-hand side function of the ODE.
+        """
+        self._terms = (a, b, c, f)
+        self.a, self.b, self.c, self.f = (_vectorize(_lambdify(term)) for term in self._terms)
+
+    @classmethod
+    def from_sympy(cls, a, b, c, f):
+        """
+        Create an ODE from symbolic coefficients in the symbol x.
+
+        Strings and numbers are converted with sympy.sympify, so that for example
+        ODE.from_sympy(-1, 0, "x**2", "sin(x)") is compiled once into NumPy callables.
+
+        Args:
+            a (sympy.Expr, str or number): Coefficient for y''(x).
+            b (sympy.Expr, str or number): Coefficient for y'(x).
+            c (sympy.Expr, str or number): Coefficient for y(x).
+            f (sympy.Expr, str or number): Right-hand side of the ODE.
+
+        Returns:
+            ODE: The ordinary differential equation with lambdified coefficients.
+        """
+        import sympy as sp # pylint: disable=C0415
+        return cls(*(sp.sympify(term) for term in (a, b, c, f)))
+
+    def evaluate(self, x):
+        """
+        Evaluate all coefficient functions at once on an array of points.
+
+        Each coefficient is called a single time with the whole array, and constant coefficients
+        returning a scalar are broadcast to the shape of x. Coefficients written for scalars are
+        evaluated pointwise by their np.vectorize fallback.
+
+        Args:
+            x (np.ndarray): Evaluation points.
+
+        Returns:
+            tuple: Arrays of a, b, c and f values, each with the shape of x.
         """
-        self.a = a
-        self.b = b
-        self.c = c
-        self.f = f
+        values = np.empty((4,) + np.shape(x))
+        for out, term in zip(values, (self.a, self.b, self.c, self.f)):
+            out[...] = term(x)
+        return tuple(values)
 
     def display(self):
         """Display the differential equation using LaTeX formatting."""
+        import sympy as sp # pylint: disable=C0415
+        from .printer import display_equation # pylint: disable=C0415
         x = sp.symbols('x')
         y = sp.Function('y')(x)  # pylint: disable=E1102
 
         # Construct the ODE in terms of sympy expressions
-        ode_lhs = self.a(x) * sp.diff(y, x, x) + self.b(x) * sp.diff(y, x) + self.c(x) * y
-        ode_rhs = self.f(x)
+        a, b, c, f = (term if isinstance(term, sp.Expr) else term(x) for term in self._terms)
+        ode_lhs = a * sp.diff(y, x, x) + b * sp.diff(y, x) + c * y
+        ode_rhs = f
         display_equation(ode_lhs, ode_rhs)
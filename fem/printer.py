@@ -28,6 +28,16 @@ class MyLatexPrinter(LatexPrinter):
                 return r'%s^{%s}' % (expr.func.__name__, exp)
         return super()._print_Function(expr, exp)
 
+_display_ready = False
+
+def setup_display():
+    """Configure SymPy printing on the first display rather than at package import."""
+    global _display_ready # pylint: disable=W0603
+    if not _display_ready:
+        sp.init_printing(latex_printer=lambda *args, **kwargs: MyLatexPrinter().doprint(*args))
+        _display_ready = True
+
 def display_equation(lhs, rhs):
+    setup_display()
     equation = sp.Eq(lhs, rhs)
     display(equation)
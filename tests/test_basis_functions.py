@@ -0,0 +1,55 @@
+"""This module contains functions to test the finite element basis functions, checking that the
+vectorized evaluations agree with the scalar ones. The testing is done using the package pytest.
+"""
+
+import numpy as np
+import pytest
+from fem.basis_functions import phi, psi, phi_vec, psi_vec, phi_uniform, eval_fe_solution
+from fem.mesh import Mesh, make_nodes
+
+nodes = make_nodes(9)
+xes = np.linspace(0, 1, 201)
+
+def test_phi_vec_matches_phi():
+    for i in range(len(nodes)):
+        for deriv in (False, True):
+            expected = np.array([phi(i, x, nodes, deriv=deriv) for x in xes])
+            assert np.allclose(phi_vec(i, xes, nodes, deriv=deriv), expected)
+            # On this uniform mesh arrays go through phi_uniform
+            assert np.allclose(phi(i, xes, nodes, deriv=deriv), expected)
+
+def test_phi_dispatches_arrays():
+    assert np.allclose(phi(3, xes, nodes), phi_vec(3, xes, nodes))
+
+def test_mesh_argument_matches_nodes():
+    mesh = Mesh(nodes)
+    for x in (0.25, xes):
+        assert np.allclose(phi(3, x, mesh, deriv=True), phi(3, x, nodes, deriv=True))
+        assert np.allclose(psi(3, x, mesh), psi(3, x, nodes))
+
+def test_phi_uniform_matches_phi_vec():
+    h = 1 / (len(nodes) - 1)
+    for i in range(len(nodes)):
+        for deriv in (False, True):
+            assert np.allclose(phi_uniform(i, xes, h, deriv=deriv), phi_vec(i, xes, nodes, deriv=deriv))
+
+def test_invalid_index_raises():
+    with pytest.raises(TypeError):
+        phi(1.5, 0.5, nodes)
+    with pytest.raises(ValueError):
+        phi(len(nodes), 0.5, nodes)
+    with pytest.raises(ValueError):
+        psi(0, 0.5, nodes)
+
+def test_psi_vec_matches_psi():
+    for i in range(1, len(nodes)):
+        for deriv in (False, True):
+            expected = np.array([psi(i, x, nodes, deriv=deriv) for x in xes])
+            assert np.allclose(psi_vec(i, xes, nodes, deriv=deriv), expected)
+
+def test_eval_fe_solution_matches_basis_sum():
+    U = np.sin(np.arange(2*len(nodes) - 1))
+    expected = sum(U[i]*phi_vec(i, xes, nodes) for i in range(len(nodes)))
+    assert np.allclose(eval_fe_solution(U, xes, nodes, 0), expected)
+    expected += sum(U[len(nodes) + i - 1]*psi_vec(i, xes, nodes) for i in range(1, len(nodes)))
+    assert np.allclose(eval_fe_solution(U, xes, nodes, 1), expected)
@@ -2,10 +2,12 @@
 and problem setups. The testing is done using the package pytest.
 """
 
+import math
 import numpy as np
+import pytest
 from fem.fem_solver import FEMSolver
 from fem.ode import ODE
-from fem.boundary_conditions import LeftDirichletBC, RightDirichletBC, LeftRobinBC, RightRobinBC
+from fem.boundary_conditions import apply_all, LeftDirichletBC, RightDirichletBC, LeftRobinBC, RightRobinBC
 
 def a_func(x):
     return -1
@@ -80,3 +82,64 @@ def test_diriplusrobin_linear():
     U = np.array([1.19467899, 1.39130801, 1.59185665, 1.79833374, 2.01280749,
        2.23742622, 2.47443988, 2.72622255, 2.99529626, 3.28435624])
     assert np.allclose(U,uh)
+
+def test_sympy_coefficients():
+    sp = pytest.importorskip("sympy")
+    sympy_ode = ODE(sp.Integer(-1), sp.Integer(0), sp.Integer(1), sp.Integer(1))
+    bc1 = LeftRobinBC(1,1)
+    bc2 = RightRobinBC(0,1)
+    uh = FEMSolver(sympy_ode,bc1,bc2,0).solve()
+    U = FEMSolver(ode,bc1,bc2,0).solve()
+    assert np.allclose(U,uh)
+
+def test_scalar_coefficients():
+    pytest.importorskip("sympy")
+    scalar_ode = ODE(a_func, b_func, lambda x: math.exp(0*x), f_func)
+    sympy_ode = ODE.from_sympy(-1, 0, 1, "1")
+    bc1 = LeftDirichletBC(0)
+    bc2 = RightRobinBC(1,1)
+    U = FEMSolver(ode,bc1,bc2,1).solve()
+    assert np.allclose(U,FEMSolver(scalar_ode,bc1,bc2,1).solve())
+    assert np.allclose(U,FEMSolver(sympy_ode,bc1,bc2,1).solve())
+
+def test_invalidate():
+    bc1 = LeftDirichletBC(0)
+    bc2 = RightRobinBC(1,1)
+    solution = FEMSolver(ode,bc1,bc2,1)
+    U = solution.solve()
+    assert np.allclose(U,solution.solve())
+    solution.ode = ODE(a_func, lambda x: 0.5, c_func, f_func)
+    solution.invalidate()
+    U = FEMSolver(solution.ode,bc1,bc2,1).solve()
+    assert np.allclose(U,solution.solve())
+
+def test_branching_coefficients():
+    branching_ode = ODE(a_func, b_func, lambda x: 1 if x < 0.5 else 2, f_func)
+    array_ode = ODE(a_func, b_func, lambda x: np.where(x < 0.5, 1, 2), f_func)
+    bc1 = LeftDirichletBC(0)
+    bc2 = RightDirichletBC(1)
+    for poly_order in (0, 1):
+        U = FEMSolver(array_ode,bc1,bc2,poly_order).solve()
+        assert np.allclose(U,FEMSolver(branching_ode,bc1,bc2,poly_order).solve())
+        assert not np.allclose(U,FEMSolver(ode,bc1,bc2,poly_order).solve())
+
+def test_invalidate_boundary_type():
+    bc1 = LeftDirichletBC(0)
+    solution = FEMSolver(ode,bc1,RightRobinBC(1,1),1)
+    solution.solve()
+    solution.rightbc = RightDirichletBC(1)
+    solution.invalidate()
+    U = FEMSolver(ode,bc1,RightDirichletBC(1),1).solve()
+    uh = solution.solve()
+    assert uh.shape == U.shape
+    assert np.allclose(U,uh)
+
+def test_apply_is_deprecated():
+    solution = FEMSolver(ode,LeftDirichletBC(2),RightRobinBC(1,1),0)
+    f_array = np.zeros(solution.k)
+    A = np.zeros((solution.k, solution.k))
+    with pytest.warns(DeprecationWarning, match="FEMSolver.solve"):
+        apply_all([solution.leftbc, solution.rightbc], f_array, A, ode, solution.mesh, solution.k - 1)
+    with pytest.warns(DeprecationWarning):
+        solution.rightbc.apply(f_array, A, ode, solution.mesh, solution.k - 1)
+    assert f_array[0] != 0 and A[-1, -1] != 0